@@ -97,11 +97,6 @@ class ASRService:
             logger.warning("empty_audio_segment", device_id=device_id)
             return
 
-        # Convert from base64 if needed
-        if isinstance(audio_data, str):
-            import base64
-            audio_data = base64.b64decode(audio_data)
-
         # Transcribe
         text, confidence = await self.transcriber.transcribe(audio_data)
 
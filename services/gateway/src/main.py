@@ -11,15 +11,17 @@ import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncIterator
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import JSONResponse
-from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST
 
 from cairu_common.config import get_gateway_settings
 from cairu_common.logging import setup_logging, get_logger
 from cairu_common.redis_client import RedisStreamClient
 from cairu_common.metrics import (
     ACTIVE_SESSIONS,
+    get_metrics,
+    get_metrics_gzip,
     set_service_info,
     set_component_health,
 )
@@ -47,6 +49,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         name=settings.service_name,
         version="0.1.0",
         environment=settings.environment,
+        device_id=DEFAULT_DEVICE_ID,
     )
 
     logger.info("gateway_starting", host=settings.gateway_host, port=settings.gateway_port)
@@ -113,13 +116,44 @@ async def health_check() -> JSONResponse:
     )
 
 
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip (q=0 refuses it)."""
+    wildcard_q = None
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        name = name.strip().lower()
+        if name not in ("gzip", "*"):
+            continue
+
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+
+        if name == "gzip":
+            return q > 0
+        wildcard_q = q
+
+    return wildcard_q is not None and wildcard_q > 0
+
+
 @app.get("/metrics")
-async def metrics():
-    """Prometheus metrics endpoint."""
-    return JSONResponse(
-        content=generate_latest().decode("utf-8"),
-        media_type=CONTENT_TYPE_LATEST,
-    )
+async def metrics(request: Request):
+    """Prometheus metrics endpoint (gzip-compressed when the scraper accepts it)."""
+    # The body depends on Accept-Encoding, so shared caches must key on it
+    headers = {"Vary": "Accept-Encoding"}
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        headers["Content-Encoding"] = "gzip"
+        return Response(
+            content=get_metrics_gzip(),
+            media_type=CONTENT_TYPE_LATEST,
+            headers=headers,
+        )
+    return Response(content=get_metrics(), media_type=CONTENT_TYPE_LATEST, headers=headers)
 
 
 # =============================================================================
@@ -5,7 +5,7 @@ Simplified for Alpha: Single device, streamlined routing.
 """
 
 import asyncio
-import base64
+import struct
 import uuid
 from datetime import datetime
 from typing import Any
@@ -19,6 +19,25 @@ from src.websocket import ConnectionManager
 
 logger = get_logger()
 
+# Piper's default output rate, used when a response doesn't carry one
+DEFAULT_TTS_SAMPLE_RATE = 22050
+
+
+def _wav_header(num_samples: int, sample_rate: int = DEFAULT_TTS_SAMPLE_RATE) -> bytes:
+    """Build the 44-byte RIFF header for 16-bit mono PCM."""
+    data_size = num_samples * 2
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b"data", data_size,
+    )
+
+
+def _pcm_to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    """Wrap raw 16-bit mono PCM in a WAV container for the device."""
+    return _wav_header(len(pcm) // 2, sample_rate) + pcm
+
 
 class AudioRouter:
     """
@@ -82,8 +101,9 @@ class AudioRouter:
         if not is_streaming:
             self._pending_requests[segment.session_id] = datetime.utcnow()
 
-        # Publish to VAD service with streaming flag
-        message_data = segment.model_dump(mode="json")
+        # Publish to VAD service with streaming flag, audio as raw bytes
+        message_data = segment.model_dump(mode="json", exclude={"audio_data"})
+        message_data["audio_data"] = audio_data
         message_data["is_streaming"] = is_streaming
         
         message_id = await self.redis.publish(
@@ -91,7 +111,7 @@ class AudioRouter:
             message_data,
         )
 
-        AUDIO_SEGMENTS_RECEIVED.labels(device_id=device_id).inc()
+        AUDIO_SEGMENTS_RECEIVED.inc()
 
         logger.debug(
             "audio_routed",
@@ -131,27 +151,25 @@ class AudioRouter:
     ) -> None:
         """Handle a response from the pipeline and send to Companion device."""
         session_id = data.get("session_id")
-        device_id = data.get("device_id")
 
         # Calculate pipeline latency
         if session_id and session_id in self._pending_requests:
             start_time = self._pending_requests.pop(session_id)
             latency_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
-            record_pipeline_latency(device_id or "unknown", latency_ms)
+            record_pipeline_latency(latency_ms)
             logger.info(
                 "pipeline_complete",
                 session_id=session_id,
                 latency_ms=round(latency_ms, 2),
             )
 
-        # Decode audio if present (stored as base64 in Redis)
-        audio_data = None
-        if "audio_data" in data:
-            audio_b64 = data.pop("audio_data")
-            if isinstance(audio_b64, str):
-                audio_data = base64.b64decode(audio_b64)
-            elif isinstance(audio_b64, bytes):
-                audio_data = audio_b64
+        # Audio arrives as raw bytes (binary stream field)
+        audio_data = data.pop("audio_data", None)
+
+        # TTS streams raw PCM chunks; the device expects playable WAV
+        if audio_data:
+            sample_rate = int(data.get("sample_rate", DEFAULT_TTS_SAMPLE_RATE))
+            audio_data = _pcm_to_wav(audio_data, sample_rate)
 
         # Build response message for Companion
         response_message = {
@@ -159,6 +177,8 @@ class AudioRouter:
             "session_id": session_id,
             "text": data.get("text", ""),
             "ui_hints": data.get("ui_hints", {}),
+            "chunk_idx": data.get("chunk_idx", 0),
+            "is_final": data.get("is_final", True),
             "timestamp": datetime.utcnow().isoformat(),
         }
 
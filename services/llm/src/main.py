@@ -24,6 +24,11 @@ from src.router import LLMRouter
 settings = get_llm_settings()
 logger = get_logger()
 
+# Metric children for the configured model, bound once instead of per request
+_LLM_LATENCY = LLM_LATENCY.labels(model=settings.llm_model, backend="ollama")
+_LLM_COMPLETION_TOKENS = LLM_TOKENS_USED.labels(model=settings.llm_model, type="completion")
+_LLM_FALLBACK_OLLAMA_FAILED = LLM_FALLBACK_COUNT.labels(reason="ollama_failed")
+
 
 class LLMService:
     """LLM inference service."""
@@ -199,19 +204,13 @@ class LLMService:
         latency_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
 
         # Record metrics
-        LLM_LATENCY.labels(
-            model=settings.llm_model,
-            backend="ollama",
-        ).observe(latency_ms)
+        _LLM_LATENCY.observe(latency_ms)
 
         if tokens_used:
-            LLM_TOKENS_USED.labels(
-                model=settings.llm_model,
-                type="completion",
-            ).inc(tokens_used)
+            _LLM_COMPLETION_TOKENS.inc(tokens_used)
 
         if is_fallback:
-            LLM_FALLBACK_COUNT.labels(reason="ollama_failed").inc()
+            _LLM_FALLBACK_OLLAMA_FAILED.inc()
 
         logger.info(
             "llm_complete",
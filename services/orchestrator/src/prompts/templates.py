@@ -4,12 +4,21 @@ LLM prompt templates for cAIru companion interactions.
 These templates create the persona and context for the AI companion.
 """
 
+from datetime import datetime
+from types import MappingProxyType
 from typing import Any
 
 from cairu_common.logging import get_logger
 
 logger = get_logger()
 
+# Map rule types to friendly descriptions
+_RULE_TYPE_MAP = MappingProxyType({
+    "time_based": "scheduled check-in",
+    "behavioral": "wellness check",
+    "care_plan": "care reminder",
+})
+
 
 class PromptBuilder:
     """Builds system prompts for LLM interactions."""
@@ -61,8 +70,6 @@ Keep it natural and warm. Don't be overly formal or clinical. Just check in like
         Returns:
             Formatted system prompt
         """
-        from datetime import datetime
-
         name = user_profile.get("preferred_name") or user_profile.get("name", "Friend")
         now = datetime.now()
 
@@ -107,14 +114,7 @@ Keep it natural and warm. Don't be overly formal or clinical. Just check in like
         """
         name = user_profile.get("preferred_name") or user_profile.get("name", "Friend")
 
-        # Map rule types to friendly descriptions
-        rule_type_map = {
-            "time_based": "scheduled check-in",
-            "behavioral": "wellness check",
-            "care_plan": "care reminder",
-        }
-
-        rule_type = rule_type_map.get(rule.get("type", ""), "friendly check-in")
+        rule_type = _RULE_TYPE_MAP.get(rule.get("type") or "", "friendly check-in")
         goal = rule.get("prompt", "Check in and see how they're doing")
 
         prompt = self.PROACTIVE_TEMPLATE.format(
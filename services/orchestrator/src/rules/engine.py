@@ -14,6 +14,12 @@ from cairu_common.logging import get_logger
 logger = get_logger()
 
 
+def _second_of_day(value: str) -> int:
+    """Convert an "HH:MM[:SS]" string to seconds since midnight."""
+    t = time.fromisoformat(value)
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
 class RulesEngine:
     """
     Evaluates proactive rules and triggers appropriate interactions.
@@ -25,10 +31,19 @@ class RulesEngine:
     - Care plan events (meal times, activity reminders)
     """
 
+    # Event rule types whose trigger checks are implemented; the others are
+    # stubs that never fire, so they are not evaluated
+    EVALUATED_EVENT_TYPES: frozenset[str] = frozenset()
+
     def __init__(self, config_path: str):
         self.config_path = config_path
         self.rules: list[dict[str, Any]] = []
 
+        # Rules partitioned by type at load time, each with its position in
+        # self.rules so equal priorities keep config order
+        self._time_rules: list[tuple[int, dict[str, Any], int, int]] = []  # (pos, rule, start_s, end_s)
+        self._event_rules: list[tuple[int, dict[str, Any]]] = []  # (pos, rule)
+
     async def load_rules(self):
         """Load rules from configuration file."""
         try:
@@ -41,6 +56,29 @@ class RulesEngine:
             self.rules = self._get_default_rules()
             logger.info("using_default_rules", count=len(self.rules))
 
+        self._index_rules()
+
+    def _index_rules(self):
+        """Partition rules by type and precompute time windows as seconds of day."""
+        self._time_rules = []
+        self._event_rules = []
+
+        for pos, rule in enumerate(self.rules):
+            rule_type = rule.get("type")
+
+            if rule_type == "time_based":
+                time_range = rule.get("trigger", {}).get("time_range", {})
+                try:
+                    start = _second_of_day(time_range.get("start", "00:00"))
+                    end = _second_of_day(time_range.get("end", "23:59"))
+                except ValueError as e:
+                    logger.error("invalid_rule_time_range", rule_name=rule.get("name"), error=str(e))
+                    continue
+                self._time_rules.append((pos, rule, start, end))
+
+            elif rule_type in self.EVALUATED_EVENT_TYPES:
+                self._event_rules.append((pos, rule))
+
     def _get_default_rules(self) -> list[dict[str, Any]]:
         """Get default rules when config file is not found."""
         return [
@@ -99,14 +137,26 @@ class RulesEngine:
         Returns:
             List of triggered rules to execute
         """
-        triggered = []
+        triggered: list[tuple[int, dict[str, Any]]] = []  # (pos, rule)
         now = datetime.now()
-        current_time = now.time()
+        # Sub-second precision keeps the end bound inclusive only at exactly
+        # HH:MM:00, as comparing datetime.time values did
+        now_s = now.hour * 3600 + now.minute * 60 + now.second + now.microsecond / 1e6
+
+        # Time windows are plain numeric comparisons - no coroutine per rule
+        for pos, rule, start, end in self._time_rules:
+            if start <= now_s <= end:
+                triggered.append((pos, rule))
+                logger.debug(
+                    "rule_triggered",
+                    device_id=device_id,
+                    rule_name=rule.get("name"),
+                )
 
-        for rule in self.rules:
+        for pos, rule in self._event_rules:
             try:
-                if await self._should_trigger(rule, device_id, state_manager, current_time):
-                    triggered.append(rule)
+                if await self._should_trigger(rule, device_id, state_manager):
+                    triggered.append((pos, rule))
                     logger.debug(
                         "rule_triggered",
                         device_id=device_id,
@@ -119,26 +169,22 @@ class RulesEngine:
                     error=str(e),
                 )
 
-        # Sort by priority (lower = higher priority)
-        triggered.sort(key=lambda r: r.get("priority", 10))
+        # Sort by priority (lower = higher priority), then config order
+        triggered.sort(key=lambda item: (item[1].get("priority", 10), item[0]))
 
-        return triggered
+        return [rule for _, rule in triggered]
 
     async def _should_trigger(
         self,
         rule: dict[str, Any],
         device_id: str,
         state_manager: Any,
-        current_time: time,
     ) -> bool:
-        """Check if a rule should trigger."""
+        """Check if a behavioral or care plan rule should trigger."""
         rule_type = rule.get("type")
         trigger = rule.get("trigger", {})
 
-        if rule_type == "time_based":
-            return self._check_time_trigger(trigger, current_time)
-
-        elif rule_type == "behavioral":
+        if rule_type == "behavioral":
             return await self._check_behavioral_trigger(trigger, device_id, state_manager)
 
         elif rule_type == "care_plan":
@@ -146,17 +192,6 @@ class RulesEngine:
 
         return False
 
-    def _check_time_trigger(self, trigger: dict, current_time: time) -> bool:
-        """Check if current time falls within trigger range."""
-        time_range = trigger.get("time_range", {})
-        start_str = time_range.get("start", "00:00")
-        end_str = time_range.get("end", "23:59")
-
-        start = time.fromisoformat(start_str)
-        end = time.fromisoformat(end_str)
-
-        return start <= current_time <= end
-
     async def _check_behavioral_trigger(
         self,
         trigger: dict,
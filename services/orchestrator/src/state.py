@@ -3,6 +3,7 @@ Conversation state management and persistence.
 """
 
 import json
+from collections.abc import AsyncIterator
 from datetime import datetime
 from typing import Any
 
@@ -10,8 +11,89 @@ import aiosqlite
 
 from cairu_common.logging import get_logger
 
+try:
+    import orjson
+
+    def _json_dumps(value: Any) -> str:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
 logger = get_logger()
 
+# Profile columns callers may change via update_user_profile
+_UPDATABLE_PROFILE_FIELDS = ("name", "preferred_name", "timezone", "life_details", "preferences")
+
+# Size of sqlite3's per-connection prepared statement cache
+STATEMENT_CACHE_SIZE = 256
+
+# =============================================================================
+# SQL statements
+# =============================================================================
+# Kept as module constants so every call passes the identical string and
+# hits sqlite3's statement cache instead of being re-parsed.
+
+# Columns consumed by prompt building; timestamps/timezone are not fetched
+_PROFILE_COLUMNS = ("user_id", "device_id", "name", "preferred_name", "life_details", "preferences")
+
+_SQL_GET_PROFILE = f"SELECT {', '.join(_PROFILE_COLUMNS)} FROM user_profiles WHERE device_id = ?"
+
+_SQL_INSERT_PROFILE = "INSERT INTO user_profiles (user_id, device_id, name) VALUES (?, ?, ?)"
+
+# Untouched columns are bound as NULL and keep their current value
+_SQL_UPDATE_PROFILE = (
+    "UPDATE user_profiles SET "
+    + ", ".join(f"{col} = COALESCE(?, {col})" for col in _UPDATABLE_PROFILE_FIELDS)
+    + ", updated_at = ? WHERE user_id = ?"
+)
+
+_SQL_GET_HISTORY = """
+    SELECT role, content FROM conversation_turns
+    WHERE session_id = ?
+    ORDER BY id DESC
+    LIMIT ?
+"""
+
+_SQL_INSERT_TURN = """
+    INSERT INTO conversation_turns (session_id, user_id, role, content, intent)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+# Free-text notes are fetched separately via get_care_plan_notes
+_CARE_PLAN_COLUMNS = ("user_id", "medications", "routines", "contacts")
+
+_SQL_GET_CARE_PLAN = f"SELECT {', '.join(_CARE_PLAN_COLUMNS)} FROM care_plans WHERE user_id = ?"
+
+_SQL_GET_CARE_PLAN_NOTES = "SELECT notes FROM care_plans WHERE user_id = ?"
+
+_SQL_GET_ACTIVE_DEVICES = """
+    SELECT device_id FROM device_sessions
+    WHERE datetime(last_activity) > datetime('now', '-1 hour')
+"""
+
+_SQL_TOUCH_DEVICE = """
+    INSERT INTO device_sessions (device_id, user_id, last_activity, session_count)
+    VALUES (?, ?, ?, 1)
+    ON CONFLICT(device_id) DO UPDATE SET
+        last_activity = excluded.last_activity,
+        session_count = session_count + 1
+"""
+
+_SQL_INSERT_FACT = """
+    INSERT INTO learned_facts (user_id, fact_type, fact_key, fact_value, source)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_SQL_GET_FACTS = """
+    SELECT fact_type, fact_key, fact_value, confidence
+    FROM learned_facts
+    WHERE user_id = ?
+    ORDER BY created_at DESC
+"""
+
 
 class ConversationStateManager:
     """
@@ -26,7 +108,10 @@ class ConversationStateManager:
 
     async def initialize(self):
         """Initialize database connection and schema."""
-        self.db = await aiosqlite.connect(self.database_path)
+        self.db = await aiosqlite.connect(
+            self.database_path,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
         await self._create_schema()
         logger.info("state_manager_initialized", database=self.database_path)
 
@@ -98,25 +183,18 @@ class ConversationStateManager:
 
     async def get_user_profile(self, device_id: str) -> dict[str, Any]:
         """Get or create user profile for a device."""
-        async with self.db.execute(
-            "SELECT * FROM user_profiles WHERE device_id = ?",
-            (device_id,)
-        ) as cursor:
+        async with self.db.execute(_SQL_GET_PROFILE, (device_id,)) as cursor:
             row = await cursor.fetchone()
 
         if row:
-            columns = [desc[0] for desc in cursor.description]
-            profile = dict(zip(columns, row))
-            profile["life_details"] = json.loads(profile.get("life_details", "{}"))
-            profile["preferences"] = json.loads(profile.get("preferences", "{}"))
+            profile = dict(zip(_PROFILE_COLUMNS, row))
+            profile["life_details"] = _json_loads(profile.get("life_details") or "{}")
+            profile["preferences"] = _json_loads(profile.get("preferences") or "{}")
             return profile
 
         # Create default profile
         user_id = f"user_{device_id}"
-        await self.db.execute(
-            "INSERT INTO user_profiles (user_id, device_id, name) VALUES (?, ?, ?)",
-            (user_id, device_id, "Friend")
-        )
+        await self.db.execute(_SQL_INSERT_PROFILE, (user_id, device_id, "Friend"))
         await self.db.commit()
 
         return {
@@ -128,22 +206,21 @@ class ConversationStateManager:
         }
 
     async def update_user_profile(self, user_id: str, updates: dict[str, Any]):
-        """Update user profile fields."""
-        # Handle JSON fields
-        if "life_details" in updates:
-            updates["life_details"] = json.dumps(updates["life_details"])
-        if "preferences" in updates:
-            updates["preferences"] = json.dumps(updates["preferences"])
-
-        updates["updated_at"] = datetime.utcnow().isoformat()
-
-        set_clause = ", ".join(f"{k} = ?" for k in updates.keys())
-        values = list(updates.values()) + [user_id]
-
-        await self.db.execute(
-            f"UPDATE user_profiles SET {set_clause} WHERE user_id = ?",
-            values
-        )
+        """Update user profile fields (omitted or None fields are left unchanged)."""
+        unknown = updates.keys() - set(_UPDATABLE_PROFILE_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot update profile fields: {sorted(unknown)}")
+
+        values = []
+        for col in _UPDATABLE_PROFILE_FIELDS:
+            value = updates.get(col)
+            # Handle JSON fields
+            if col in ("life_details", "preferences") and value is not None:
+                value = _json_dumps(value)
+            values.append(value)
+        values += [datetime.utcnow().isoformat(), user_id]
+
+        await self.db.execute(_SQL_UPDATE_PROFILE, values)
         await self.db.commit()
 
     async def get_conversation_history(
@@ -152,15 +229,7 @@ class ConversationStateManager:
         limit: int = 10,
     ) -> list[dict[str, str]]:
         """Get recent conversation turns for a session."""
-        async with self.db.execute(
-            """
-            SELECT role, content FROM conversation_turns
-            WHERE session_id = ?
-            ORDER BY id DESC
-            LIMIT ?
-            """,
-            (session_id, limit)
-        ) as cursor:
+        async with self.db.execute(_SQL_GET_HISTORY, (session_id, limit)) as cursor:
             rows = await cursor.fetchall()
 
         # Return in chronological order
@@ -176,28 +245,21 @@ class ConversationStateManager:
     ):
         """Add a conversation turn."""
         await self.db.execute(
-            """
-            INSERT INTO conversation_turns (session_id, user_id, role, content, intent)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (session_id, user_id, role, content, intent)
+            _SQL_INSERT_TURN,
+            (session_id, user_id, role, content, intent),
         )
         await self.db.commit()
 
     async def get_care_plan(self, user_id: str) -> dict[str, Any]:
         """Get care plan for a user."""
-        async with self.db.execute(
-            "SELECT * FROM care_plans WHERE user_id = ?",
-            (user_id,)
-        ) as cursor:
+        async with self.db.execute(_SQL_GET_CARE_PLAN, (user_id,)) as cursor:
             row = await cursor.fetchone()
 
         if row:
-            columns = [desc[0] for desc in cursor.description]
-            plan = dict(zip(columns, row))
-            plan["medications"] = json.loads(plan.get("medications", "[]"))
-            plan["routines"] = json.loads(plan.get("routines", "[]"))
-            plan["contacts"] = json.loads(plan.get("contacts", "[]"))
+            plan = dict(zip(_CARE_PLAN_COLUMNS, row))
+            plan["medications"] = _json_loads(plan.get("medications") or "[]")
+            plan["routines"] = _json_loads(plan.get("routines") or "[]")
+            plan["contacts"] = _json_loads(plan.get("contacts") or "[]")
             return plan
 
         return {
@@ -207,14 +269,16 @@ class ConversationStateManager:
             "contacts": [],
         }
 
+    async def get_care_plan_notes(self, user_id: str) -> str | None:
+        """Get free-text care plan notes for a user."""
+        async with self.db.execute(_SQL_GET_CARE_PLAN_NOTES, (user_id,)) as cursor:
+            row = await cursor.fetchone()
+
+        return row[0] if row else None
+
     async def get_active_devices(self) -> list[str]:
         """Get list of recently active devices."""
-        async with self.db.execute(
-            """
-            SELECT device_id FROM device_sessions
-            WHERE datetime(last_activity) > datetime('now', '-1 hour')
-            """
-        ) as cursor:
+        async with self.db.execute(_SQL_GET_ACTIVE_DEVICES) as cursor:
             rows = await cursor.fetchall()
 
         return [row[0] for row in rows]
@@ -222,14 +286,8 @@ class ConversationStateManager:
     async def update_device_activity(self, device_id: str, user_id: str | None = None):
         """Update device last activity timestamp."""
         await self.db.execute(
-            """
-            INSERT INTO device_sessions (device_id, user_id, last_activity, session_count)
-            VALUES (?, ?, ?, 1)
-            ON CONFLICT(device_id) DO UPDATE SET
-                last_activity = excluded.last_activity,
-                session_count = session_count + 1
-            """,
-            (device_id, user_id, datetime.utcnow().isoformat())
+            _SQL_TOUCH_DEVICE,
+            (device_id, user_id, datetime.utcnow().isoformat()),
         )
         await self.db.commit()
 
@@ -243,35 +301,28 @@ class ConversationStateManager:
     ):
         """Store a learned fact about the user."""
         await self.db.execute(
-            """
-            INSERT INTO learned_facts (user_id, fact_type, fact_key, fact_value, source)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (user_id, fact_type, fact_key, fact_value, source)
+            _SQL_INSERT_FACT,
+            (user_id, fact_type, fact_key, fact_value, source),
         )
         await self.db.commit()
         logger.debug("fact_learned", user_id=user_id, fact_type=fact_type, fact_key=fact_key)
 
+    async def iter_learned_facts(self, user_id: str) -> AsyncIterator[dict[str, Any]]:
+        """
+        Stream learned facts for a user, newest first, without materializing all rows.
+
+        Wrap in contextlib.aclosing() when breaking out early so the cursor
+        is closed immediately.
+        """
+        async with self.db.execute(_SQL_GET_FACTS, (user_id,)) as cursor:
+            async for row in cursor:
+                yield {
+                    "type": row[0],
+                    "key": row[1],
+                    "value": row[2],
+                    "confidence": row[3],
+                }
+
     async def get_learned_facts(self, user_id: str) -> list[dict[str, Any]]:
         """Get all learned facts for a user."""
-        async with self.db.execute(
-            """
-            SELECT fact_type, fact_key, fact_value, confidence
-            FROM learned_facts
-            WHERE user_id = ?
-            ORDER BY created_at DESC
-            """,
-            (user_id,)
-        ) as cursor:
-            rows = await cursor.fetchall()
-
-        return [
-            {
-                "type": row[0],
-                "key": row[1],
-                "value": row[2],
-                "confidence": row[3],
-            }
-            for row in rows
-        ]
-
+        return [fact async for fact in self.iter_learned_facts(user_id)]
@@ -6,9 +6,10 @@ Consumes from tts:requests and publishes to audio:outbound.
 """
 
 import asyncio
-import base64
 import signal
-from datetime import datetime
+import time
+
+import uvloop
 
 from cairu_common.config import get_tts_settings
 from cairu_common.logging import setup_logging, get_logger
@@ -18,7 +19,7 @@ from cairu_common.metrics import TTS_LATENCY, set_service_info, set_component_he
 from src.synthesizer import PiperSynthesizer
 
 settings = get_tts_settings()
-logger = get_logger()
+logger = get_logger(service="tts")
 
 
 class TTSService:
@@ -44,6 +45,8 @@ class TTSService:
         self.synthesizer = PiperSynthesizer(
             voice=settings.piper_voice,
             model_path=settings.piper_model_path,
+            quantize=settings.piper_quantize,
+            cache_size=settings.piper_cache_size,
         )
         await self.synthesizer.load_model()
         set_component_health("piper_model", True)
@@ -65,6 +68,8 @@ class TTSService:
         self._running = False
         if self.redis:
             await self.redis.disconnect()
+        if self.synthesizer:
+            self.synthesizer.close()
         logger.info("tts_service_stopped")
 
     async def _process_requests(self):
@@ -72,22 +77,24 @@ class TTSService:
         if not self.redis or not self.synthesizer:
             raise RuntimeError("Service not initialized")
 
-        async for message_id, data in self.redis.consume(
+        async for batch in self.redis.consume_batch(
             RedisStreamClient.STREAMS["tts_requests"],
             consumer_group="tts",
             consumer_name="tts-main",
+            count=16,
         ):
             if not self._running:
                 break
 
-            try:
-                await self._handle_request(data)
-            except Exception as e:
-                logger.error("tts_processing_error", message_id=message_id, error=str(e))
+            for message_id, data in batch:
+                try:
+                    await self._handle_request(data)
+                except Exception as e:
+                    logger.error("tts_processing_error", message_id=message_id, error=str(e))
 
     async def _handle_request(self, data: dict):
         """Handle a TTS request and synthesize speech."""
-        start_time = datetime.utcnow()
+        t0 = time.perf_counter_ns()
 
         request_id = data.get("request_id", "unknown")
         device_id = data.get("device_id", "unknown")
@@ -104,37 +111,52 @@ class TTSService:
             text_length=len(text),
         )
 
-        # Synthesize speech
-        audio_data, duration_ms = await self.synthesizer.synthesize(text)
+        # Stream each chunk out as soon as Piper produces it
+        sample_rate = self.synthesizer.sample_rate
+        chunk_idx = 0
+        audio_duration_ms = 0
+        first_chunk_ms = 0.0
 
-        # Calculate latency
-        latency_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
-        TTS_LATENCY.observe(latency_ms)
-
-        logger.info(
-            "speech_synthesized",
-            request_id=request_id,
-            audio_duration_ms=duration_ms,
-            latency_ms=round(latency_ms, 2),
-        )
+        async for pcm, is_final in self.synthesizer.synthesize(text):
+            duration_ms = len(pcm) * 1000 // (2 * sample_rate)
+            audio_duration_ms += duration_ms
+            latency_ms = (time.perf_counter_ns() - t0) / 1e6
 
-        # Publish to outbound stream
-        # Encode audio as base64 for Redis transport
-        await self.redis.publish(
-            RedisStreamClient.STREAMS["audio_outbound"],
-            {
+            message = {
                 "request_id": request_id,
                 "device_id": device_id,
                 "session_id": session_id,
-                "audio_data": base64.b64encode(audio_data).decode("utf-8"),
+                "chunk_idx": chunk_idx,
+                "is_final": is_final,
+                # Raw 16-bit mono PCM, sent as a binary stream field
+                "audio_data": pcm,
+                "sample_rate": sample_rate,
                 "duration_ms": duration_ms,
                 "latency_ms": int(latency_ms),
-                "text": text,
-                "ui_hints": {
+            }
+            if chunk_idx == 0:
+                first_chunk_ms = latency_ms
+                # Text and UI hints only travel with the first chunk
+                message["text"] = text
+                message["ui_hints"] = {
                     "show_text": True,
                     "mood": "neutral",
-                },
-            },
+                }
+
+            await self.redis.publish(RedisStreamClient.STREAMS["audio_outbound"], message)
+            chunk_idx += 1
+
+        # Calculate latency
+        latency_ms = (time.perf_counter_ns() - t0) / 1e6
+        TTS_LATENCY.observe(latency_ms)
+
+        logger.info(
+            "speech_synthesized",
+            request_id=request_id,
+            audio_duration_ms=audio_duration_ms,
+            chunks=chunk_idx,
+            first_chunk_ms=round(first_chunk_ms, 2),
+            latency_ms=round(latency_ms, 2),
         )
 
 
@@ -142,7 +164,7 @@ async def main():
     """Entry point."""
     service = TTSService()
 
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
     for sig in (signal.SIGTERM, signal.SIGINT):
         loop.add_signal_handler(sig, lambda: asyncio.create_task(service.stop()))
 
@@ -150,5 +172,5 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    uvloop.run(main())
 
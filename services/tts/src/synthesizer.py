@@ -3,15 +3,22 @@ Piper TTS synthesizer for text-to-speech.
 """
 
 import asyncio
-import io
-from functools import partial
+import concurrent.futures
+import json
+import os
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterator
 
 import numpy as np
-import soundfile as sf
 
 from cairu_common.logging import get_logger
+from cairu_common.metrics import TTS_CACHE_REQUESTS
 
-logger = get_logger()
+logger = get_logger(service="tts")
+
+# Bound once so each synthesis skips the .labels() lookup
+_TTS_CACHE_HIT = TTS_CACHE_REQUESTS.labels(result="hit")
+_TTS_CACHE_MISS = TTS_CACHE_REQUESTS.labels(result="miss")
 
 
 class PiperSynthesizer:
@@ -23,33 +30,66 @@ class PiperSynthesizer:
     """
 
     SAMPLE_RATE = 22050  # Piper default
-
-    def __init__(self, voice: str = "en_US-lessac-medium", model_path: str = "/app/models"):
+    CACHE_MAX_TEXT_LENGTH = 120  # Only short, likely-repeated phrases are cached
+
+    def __init__(
+        self,
+        voice: str = "en_US-lessac-medium",
+        model_path: str = "/app/models",
+        quantize: bool = True,
+        cache_size: int = 64,
+    ):
         """
         Initialize synthesizer.
 
         Args:
             voice: Piper voice identifier
             model_path: Path to model files
+            quantize: Run a dynamically INT8-quantized copy of the voice model
+            cache_size: Number of synthesized phrases to keep (0 disables caching)
         """
         self.voice = voice
         self.model_path = model_path
+        self.quantize = quantize
+        self.cache_size = cache_size
         self._piper = None
 
+        # LRU of text -> synthesized PCM chunks for repeated phrases
+        self._cache: OrderedDict[str, list[bytes]] = OrderedDict()
+
+        # Inference gets its own thread so Piper's ONNX session owns the CPU
+        # cores instead of competing with unrelated work on the default pool
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="piper"
+        )
+
+    def close(self):
+        """Shut down the inference thread."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
     async def load_model(self):
         """Load the Piper voice model."""
         logger.info("loading_piper_model", voice=self.voice)
 
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, self._load_model_sync)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._load_model_sync)
+
+        if self._piper is not None:
+            # Run one short synthesis so the first real request doesn't pay
+            # for ONNX Runtime's arena allocation and kernel setup
+            await loop.run_in_executor(self._executor, self._warm_up_sync)
 
         logger.info("piper_model_loaded", voice=self.voice)
 
+    def _warm_up_sync(self):
+        """Synthesize and discard a short phrase, bypassing the cache."""
+        for _ in self._piper.synthesize("Hello."):
+            pass
+
     def _load_model_sync(self):
         """Synchronous model loading."""
         try:
-            from piper import PiperVoice
-            import os
+            from piper import PiperConfig, PiperVoice
             import urllib.request
 
             # Build model path
@@ -73,7 +113,11 @@ class PiperSynthesizer:
                     self._piper = None
                     return
 
-            self._piper = PiperVoice.load(onnx_file)
+            with open(json_file, encoding="utf-8") as f:
+                config = PiperConfig.from_dict(json.load(f))
+
+            # Hand Piper our own ONNX Runtime session instead of its default one
+            self._piper = PiperVoice(config=config, session=self._load_session(onnx_file))
             
         except ImportError:
             logger.warning("piper_not_installed_using_fallback")
@@ -82,57 +126,149 @@ class PiperSynthesizer:
             logger.warning("piper_load_failed_using_fallback", error=str(e))
             self._piper = None
 
-    async def synthesize(self, text: str) -> tuple[bytes, int]:
-        """
-        Synthesize speech from text.
+    def _load_session(self, onnx_file: str):
+        """Create the session, on the INT8 model if enabled, else the original."""
+        if self.quantize:
+            int8_file = self._quantize_model(onnx_file)
+            if int8_file != onnx_file:
+                try:
+                    return self._create_session(int8_file)
+                except Exception as e:
+                    logger.warning("piper_int8_session_failed_using_fp32", error=str(e))
 
-        Args:
-            text: Text to synthesize
+        return self._create_session(onnx_file)
 
-        Returns:
-            Tuple of (audio_bytes, duration_ms)
+    def _quantize_model(self, onnx_file: str) -> str:
         """
-        loop = asyncio.get_event_loop()
-        audio_bytes, duration_ms = await loop.run_in_executor(
-            None,
-            partial(self._synthesize_sync, text),
-        )
-
-        return audio_bytes, duration_ms
+        Get a dynamically INT8-quantized copy of the voice model.
 
-    def _synthesize_sync(self, text: str) -> tuple[bytes, int]:
-        """Synchronous speech synthesis."""
-        if self._piper is None:
-            # Fallback: generate silence for development
-            return self._generate_silence(len(text) * 50)  # ~50ms per character
-
-        # Synthesize with Piper (new API)
-        audio_samples = []
-        for audio_chunk in self._piper.synthesize(text):
-            audio_samples.append(audio_chunk.audio_int16_array)
-
-        if not audio_samples:
-            return self._generate_silence(500)
-
-        audio = np.concatenate(audio_samples)
+        The copy is cached next to the original and rebuilt when the original
+        is newer. It is written to a temporary file and moved into place, so
+        an interrupted run never leaves a truncated copy behind. Falls back
+        to the original model if quantization fails.
+        """
+        int8_file = onnx_file.removesuffix(".onnx") + ".int8.onnx"
 
-        # Convert to WAV bytes
-        buffer = io.BytesIO()
-        sf.write(buffer, audio, self.SAMPLE_RATE, format="WAV", subtype="PCM_16")
-        wav_bytes = buffer.getvalue()
+        if os.path.exists(int8_file) and os.path.getmtime(int8_file) >= os.path.getmtime(onnx_file):
+            return int8_file
 
-        # Calculate duration
-        duration_ms = int(len(audio) / self.SAMPLE_RATE * 1000)
+        tmp_file = int8_file + ".part"
+        try:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            logger.info("quantizing_piper_model", voice=self.voice)
+            quantize_dynamic(
+                onnx_file,
+                tmp_file,
+                weight_type=QuantType.QInt8,
+                op_types_to_quantize=["MatMul", "Gemm", "Conv"],
+            )
+            os.replace(tmp_file, int8_file)
+            logger.info("piper_model_quantized", voice=self.voice)
+            return int8_file
+        except Exception as e:
+            logger.warning("piper_quantization_failed_using_fp32", error=str(e))
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            return onnx_file
+
+    def _create_session(self, onnx_file: str):
+        """Create an ONNX Runtime CPU session tuned for synthesis throughput."""
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = os.cpu_count() or 1
+
+        return ort.InferenceSession(
+            onnx_file,
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
 
-        return wav_bytes, duration_ms
+    @property
+    def sample_rate(self) -> int:
+        """Sample rate of the synthesized audio."""
+        if self._piper is not None:
+            return self._piper.config.sample_rate
+        return self.SAMPLE_RATE
 
-    def _generate_silence(self, duration_ms: int) -> tuple[bytes, int]:
-        """Generate silent audio for development/fallback."""
-        num_samples = int(self.SAMPLE_RATE * duration_ms / 1000)
-        silence = np.zeros(num_samples, dtype=np.int16)
+    async def synthesize(self, text: str) -> AsyncIterator[tuple[bytes, bool]]:
+        """
+        Synthesize speech from text, streaming audio as Piper produces it.
 
-        buffer = io.BytesIO()
-        sf.write(buffer, silence, self.SAMPLE_RATE, format="WAV", subtype="PCM_16")
+        Piper emits one chunk per sentence; each is yielded once the next
+        one is synthesized, so only the last chunk is marked final. Short
+        phrases that were synthesized before are replayed from the cache.
 
-        return buffer.getvalue(), duration_ms
+        Args:
+            text: Text to synthesize
 
+        Yields:
+            Tuples of (pcm_chunk, is_final) with raw 16-bit mono PCM at
+            `sample_rate`
+        """
+        if self._piper is None:
+            # Fallback: generate silence for development
+            yield self._generate_silence(len(text) * 50), True  # ~50ms per character
+            return
+
+        key = text.strip()
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            _TTS_CACHE_HIT.inc()
+            for i, pcm in enumerate(cached):
+                yield pcm, i == len(cached) - 1
+            return
+        _TTS_CACHE_MISS.inc()
+
+        loop = asyncio.get_running_loop()
+        chunks = iter(self._piper.synthesize(text))
+
+        chunk = await loop.run_in_executor(self._executor, self._next_chunk, chunks)
+        if chunk is None:
+            yield self._generate_silence(500), True
+            return
+
+        # Synthesize one sentence ahead so the last real chunk carries
+        # is_final, the same sequence a cache hit replays
+        pcm_chunks = [chunk]
+        while True:
+            chunk = await loop.run_in_executor(self._executor, self._next_chunk, chunks)
+            if chunk is None:
+                break
+            yield pcm_chunks[-1], False
+            pcm_chunks.append(chunk)
+
+        self._cache_phrase(key, pcm_chunks)
+        yield pcm_chunks[-1], True
+
+    def _cache_phrase(self, key: str, pcm_chunks: list[bytes]) -> None:
+        """Remember a short phrase's audio, evicting the least recently used."""
+        if not self.cache_size or len(key) > self.CACHE_MAX_TEXT_LENGTH:
+            return
+
+        self._cache[key] = pcm_chunks
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _next_chunk(chunks: Iterator) -> bytes | None:
+        """Synthesize the next sentence, or return None when done."""
+        audio_chunk = next(chunks, None)
+        if audio_chunk is None:
+            return None
+
+        # Piper already clips to [-1, 1], so scale its float buffer in place
+        # and cast once instead of going through audio_int16_array's
+        # scaled, clipped and cast temporaries
+        audio = audio_chunk.audio_float_array
+        np.multiply(audio, 32767.0, out=audio)
+        return audio.astype(np.int16).tobytes()
+
+    def _generate_silence(self, duration_ms: int) -> bytes:
+        """Generate silent PCM audio for development/fallback."""
+        num_samples = int(self.sample_rate * duration_ms / 1000)
+        return b"\x00" * (num_samples * 2)
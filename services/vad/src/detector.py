@@ -3,24 +3,42 @@ Silero VAD wrapper for voice activity detection with boundary detection.
 """
 
 import asyncio
-from functools import partial
+import concurrent.futures
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
+from functools import partial
 
 import numpy as np
-import torch
-
 from cairu_common.logging import get_logger
 
-logger = get_logger()
+logger = get_logger(service="vad")
+
+
+def _sum_squares(samples: np.ndarray) -> int:
+    """Sum of squared int16 samples, accumulated in int64 without a float copy."""
+    return int(np.einsum("i,i->", samples, samples, dtype=np.int64))
 
 
 @dataclass
 class VADState:
     """Tracks VAD state for a device/session."""
     is_speaking: bool = False
-    audio_buffer: list = field(default_factory=list)
+    audio_buffer: bytearray = field(default_factory=bytearray)
+    chunk_count: int = 0  # Chunks accumulated in audio_buffer
     speech_chunks: int = 0
     silence_chunks: int = 0
+    last_activity: float = field(default_factory=time.monotonic)
+
+    # Silero recurrent state and trailing context, kept per session so
+    # concurrent streams don't feed each other's history into the model
+    model_state: np.ndarray = field(default_factory=lambda: np.zeros((2, 1, 128), dtype=np.float32))
+    context: np.ndarray = field(default_factory=lambda: np.zeros(64, dtype=np.float32))
+    # Samples after the last full window, prepended to the next chunk
+    remainder: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int16))
     
     # Thresholds for boundary detection
     # Client sends 100ms chunks, so adjust accordingly
@@ -40,67 +58,160 @@ class SileroVAD:
     # Audio parameters expected by Silero
     SAMPLE_RATE = 16000
     CHUNK_SIZE = 512  # 32ms at 16kHz
+    CONTEXT_SIZE = 64  # Trailing samples of the previous window prepended to each input
 
-    def __init__(self, threshold: float = 0.5):
+    # Below this RMS a chunk is treated as silence without running the model
+    # while no speech is in progress (well under _detect_energy's 800 speech level)
+    SILENCE_RMS_THRESHOLD = 300
+
+    # Session tracking limits (sessions abandoned mid-speech are never reset)
+    MAX_SESSIONS = 32
+    SESSION_IDLE_TIMEOUT_S = 60.0
+
+    # Pinned release of the Silero ONNX model (v5 interface: input, state, sr)
+    MODEL_URL = "https://github.com/snakers4/silero-vad/raw/v5.1.2/src/silero_vad/data/silero_vad.onnx"
+
+    def __init__(self, threshold: float = 0.5, model_path: str = "/app/models"):
         """
         Initialize VAD.
 
         Args:
             threshold: Speech probability threshold (0.0-1.0)
+            model_path: Directory the ONNX model is cached in
         """
         self.threshold = threshold
-        self.model = None
-        self._utils = None
+        self.model_path = model_path
+
+        # ONNX Runtime session, driven directly through IOBinding
+        self.session = None
+        self._binding = None
+
+        # Preallocated model inputs: [context | window], recurrent state, sample rate
+        self._input_buf = np.zeros((1, self.CONTEXT_SIZE + self.CHUNK_SIZE), dtype=np.float32)
+        self._state = np.zeros((2, 1, 128), dtype=np.float32)
+        self._sr = np.array(self.SAMPLE_RATE, dtype=np.int64)
+
+        # Preallocated model outputs: speech probability and next recurrent state
+        self._prob_buf = np.empty((1, 1), dtype=np.float32)
+        self._state_out = np.empty_like(self._state)
         
-        # Track state per session
-        self._sessions: dict[str, VADState] = {}
+        # Track state per session, least recently used first
+        self._sessions: OrderedDict[str, VADState] = OrderedDict()
+
+        # Single inference thread: keeps ONNX off the shared default pool and
+        # serializes access to the preallocated model buffers
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="silero"
+        )
+
+    def close(self):
+        """Shut down the inference thread."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
     async def load_model(self):
         """Load the Silero VAD model."""
         logger.info("loading_silero_vad")
 
         # Run in executor to avoid blocking
-        loop = asyncio.get_event_loop()
-        self.model, self._utils = await loop.run_in_executor(
-            None,
+        loop = asyncio.get_running_loop()
+        self.session = await loop.run_in_executor(
+            self._executor,
             self._load_model_sync,
         )
 
+        if self.session is not None:
+            self._bind_io()
+
+            # Run one window so the first real chunk doesn't pay for ONNX
+            # Runtime's arena allocation and kernel setup
+            await self.detect(b"\x00" * 1024)
+            self.reset_states()
+
         logger.info("silero_vad_loaded")
 
     def _load_model_sync(self):
         """Synchronous model loading."""
         try:
-            model, utils = torch.hub.load(
-                repo_or_dir="snakers4/silero-vad",
-                model="silero_vad",
-                force_reload=False,
-                onnx=True,  # Use ONNX for better compatibility
+            import urllib.request
+
+            import onnxruntime as ort
+
+            onnx_file = os.path.join(self.model_path, "silero_vad.onnx")
+
+            # Download once into the model cache
+            if not os.path.exists(onnx_file):
+                logger.info("silero_vad_not_found_downloading")
+                os.makedirs(self.model_path, exist_ok=True)
+                urllib.request.urlretrieve(self.MODEL_URL, f"{onnx_file}.part")
+                os.replace(f"{onnx_file}.part", onnx_file)
+                logger.info("silero_vad_downloaded")
+
+            # The model is tiny and runs one window at a time; extra threads
+            # only add synchronization overhead
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            options.intra_op_num_threads = 1
+            options.inter_op_num_threads = 1
+
+            return ort.InferenceSession(
+                onnx_file,
+                sess_options=options,
+                providers=["CPUExecutionProvider"],
             )
-            return model, utils
+        except ImportError:
+            logger.warning("onnxruntime_not_installed_using_fallback")
+            return None
         except Exception as e:
             logger.warning("silero_vad_load_failed_using_fallback", error=str(e))
-            return None, None
+            return None
 
-    async def detect(self, audio_bytes: bytes) -> tuple[bool, float]:
+    def _bind_io(self):
+        """Bind the preallocated input and output buffers to the ONNX session once."""
+        binding = self.session.io_binding()
+        for name, buf in (("input", self._input_buf), ("state", self._state), ("sr", self._sr)):
+            binding.bind_input(
+                name,
+                device_type="cpu",
+                device_id=0,
+                element_type=buf.dtype.type,
+                shape=buf.shape,
+                buffer_ptr=buf.ctypes.data,
+            )
+        for name, buf in (("output", self._prob_buf), ("stateN", self._state_out)):
+            binding.bind_output(
+                name,
+                device_type="cpu",
+                device_id=0,
+                element_type=buf.dtype.type,
+                shape=buf.shape,
+                buffer_ptr=buf.ctypes.data,
+            )
+        self._binding = binding
+
+    async def detect(
+        self,
+        audio_bytes: bytes,
+        state: VADState | None = None,
+    ) -> tuple[bool, float]:
         """
         Detect voice activity in audio.
 
         Args:
             audio_bytes: Raw audio bytes (16kHz, 16-bit PCM)
+            state: Session state to continue the model from (None = fresh state)
 
         Returns:
             Tuple of (has_speech, probability)
         """
-        if self.model is None:
+        if self.session is None:
             # Fallback: use simple energy-based detection
             return self._detect_energy(audio_bytes)
 
         # Run inference in executor to avoid blocking
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         probability = await loop.run_in_executor(
-            None,
-            partial(self._detect_sync, audio_bytes),
+            self._executor,
+            partial(self._detect_sync, audio_bytes, state),
         )
 
         has_speech = probability >= self.threshold
@@ -114,10 +225,10 @@ class SileroVAD:
         Works when Silero model isn't available.
         """
         # Convert to numpy
-        audio = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32)
+        audio = np.frombuffer(audio_bytes, dtype=np.int16)
         
         # Calculate RMS energy
-        rms = np.sqrt(np.mean(audio ** 2))
+        rms = math.sqrt(_sum_squares(audio) / audio.size) if audio.size else 0.0
         
         # Normalize to 0-1 range (assuming 16-bit audio)
         # Typical speech RMS is ~2000-10000, silence is ~100-500
@@ -126,42 +237,104 @@ class SileroVAD:
         # Threshold for speech detection
         has_speech = rms > 800  # Adjust based on your mic
         
-        logger.debug("vad_energy", rms=round(rms, 0), has_speech=has_speech)
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug("vad_energy", rms=round(rms, 0), has_speech=has_speech)
         
         return has_speech, normalized
 
-    def _detect_sync(self, audio_bytes: bytes) -> float:
-        """Synchronous VAD inference."""
+    def _detect_sync(self, audio_bytes: bytes, state: VADState | None = None) -> float:
+        """
+        Synchronous VAD inference.
+
+        Silero scores fixed 512-sample windows, so the chunk is fed window by
+        window and the highest speech probability is returned. Trailing
+        samples that don't fill a window are carried over to the session's
+        next chunk, so the model sees one continuous stream (without a
+        session they are ignored).
+        """
         # Convert bytes to numpy array (16-bit PCM)
         audio_int16 = np.frombuffer(audio_bytes, dtype=np.int16)
+        if state is not None and state.remainder.size:
+            audio_int16 = np.concatenate((state.remainder, audio_int16))
+
+        context = self._input_buf[0, :self.CONTEXT_SIZE]
+        window = self._input_buf[0, self.CONTEXT_SIZE:]
+        speech_prob = 0.0
+
+        # Load the session's history into the bound buffers
+        if state is None:
+            self.reset_states()
+        else:
+            self._state[...] = state.model_state
+            context[:] = state.context
+
+        consumed = len(audio_int16) - len(audio_int16) % self.CHUNK_SIZE
+        for start in range(0, consumed, self.CHUNK_SIZE):
+            # Normalize to float32 [-1, 1] straight into the bound input buffer
+            np.divide(audio_int16[start:start + self.CHUNK_SIZE], 32768.0, out=window)
 
-        # Normalize to float32 [-1, 1]
-        audio_float = audio_int16.astype(np.float32) / 32768.0
+            # Outputs land directly in the bound buffers
+            self.session.run_with_iobinding(self._binding)
 
-        # Convert to tensor
-        audio_tensor = torch.from_numpy(audio_float)
+            self._state[...] = self._state_out
+            context[:] = window[-self.CONTEXT_SIZE:]
+            speech_prob = max(speech_prob, float(self._prob_buf[0, 0]))
 
-        # Get speech probability
-        with torch.no_grad():
-            speech_prob = self.model(audio_tensor, self.SAMPLE_RATE).item()
+        if state is not None:
+            state.model_state[...] = self._state
+            state.context[:] = context
+            state.remainder = audio_int16[consumed:].copy()
 
         return speech_prob
 
     def reset_states(self):
         """Reset model states (call between different audio streams)."""
-        if self.model is not None:
-            self.model.reset_states()
+        self._state.fill(0.0)
+        self._input_buf.fill(0.0)
     
     def get_session_state(self, session_id: str) -> VADState:
         """Get or create state for a session."""
-        if session_id not in self._sessions:
-            self._sessions[session_id] = VADState()
-        return self._sessions[session_id]
+        state = self._sessions.get(session_id)
+        if state is None:
+            state = self._sessions[session_id] = VADState()
+            if len(self._sessions) > self.MAX_SESSIONS:
+                evicted, _ = self._sessions.popitem(last=False)
+                logger.info("vad_session_evicted", session_id=evicted, reason="capacity")
+        else:
+            self._sessions.move_to_end(session_id)
+
+        state.last_activity = time.monotonic()
+        return state
     
     def reset_session(self, session_id: str):
         """Reset state for a session."""
         if session_id in self._sessions:
             del self._sessions[session_id]
+
+    def evict_idle_sessions(self, max_idle_s: float | None = None) -> int:
+        """
+        Drop sessions that haven't received audio recently.
+
+        Args:
+            max_idle_s: Idle time after which a session is dropped
+                (defaults to SESSION_IDLE_TIMEOUT_S)
+
+        Returns:
+            Number of sessions evicted
+        """
+        cutoff = time.monotonic() - (max_idle_s or self.SESSION_IDLE_TIMEOUT_S)
+        evicted = 0
+
+        # Sessions are kept in recency order, so stop at the first active one
+        while self._sessions:
+            session_id, state = next(iter(self._sessions.items()))
+            if state.last_activity > cutoff:
+                break
+            del self._sessions[session_id]
+            evicted += 1
+            logger.info("vad_session_evicted", session_id=session_id, reason="idle")
+
+        return evicted
     
     async def process_with_boundary(
         self, 
@@ -182,23 +355,36 @@ class SileroVAD:
         """
         state = self.get_session_state(session_id)
         
-        # Detect speech in this chunk
-        has_speech, probability = await self.detect(audio_bytes)
+        # Detect speech in this chunk, skipping Silero for near-silent chunks
+        # between utterances
+        samples = np.frombuffer(audio_bytes, dtype=np.int16)
+        if (
+            not state.is_speaking
+            and _sum_squares(samples) < self.SILENCE_RMS_THRESHOLD ** 2 * samples.size
+        ):
+            has_speech, probability = False, 0.0
+            # The model didn't see this chunk, so a carried-over tail would
+            # no longer be contiguous with the next one
+            state.remainder = state.remainder[:0]
+        else:
+            has_speech, probability = await self.detect(audio_bytes, state)
         
-        # Debug logging
-        logger.debug(
-            "vad_chunk",
-            session_id=session_id,
-            has_speech=has_speech,
-            prob=round(probability, 2),
-            is_speaking=state.is_speaking,
-            silence_chunks=state.silence_chunks,
-        )
+        # Debug logging (runs per chunk, so skip building the event when disabled)
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(
+                "vad_chunk",
+                session_id=session_id,
+                has_speech=has_speech,
+                prob=round(probability, 2),
+                is_speaking=state.is_speaking,
+                silence_chunks=state.silence_chunks,
+            )
         
         if has_speech:
             state.speech_chunks += 1
             state.silence_chunks = 0
-            state.audio_buffer.append(audio_bytes)
+            state.audio_buffer.extend(audio_bytes)
+            state.chunk_count += 1
             
             # Start speaking
             if not state.is_speaking and state.speech_chunks >= state.SPEECH_START_CHUNKS:
@@ -210,20 +396,21 @@ class SileroVAD:
             
             # If we were speaking, still accumulate (captures trailing audio)
             if state.is_speaking:
-                state.audio_buffer.append(audio_bytes)
+                state.audio_buffer.extend(audio_bytes)
+                state.chunk_count += 1
             
             # End of speech detected
             if state.is_speaking and state.silence_chunks >= state.SILENCE_END_CHUNKS:
                 # Check if we have enough speech
-                total_chunks = len(state.audio_buffer)
+                total_chunks = state.chunk_count
                 if total_chunks >= state.MIN_SPEECH_CHUNKS:
-                    # Combine all audio
-                    full_audio = b''.join(state.audio_buffer)
+                    # Single copy out of the accumulated buffer
+                    full_audio = bytes(state.audio_buffer)
                     logger.info(
                         "speech_ended", 
                         session_id=session_id,
                         chunks=total_chunks,
-                        duration_ms=total_chunks * 32,
+                        duration_ms=len(full_audio) // 32,  # 16kHz * 2 bytes = 32 bytes/ms
                     )
                     
                     # Reset state for next utterance
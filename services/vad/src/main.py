@@ -6,8 +6,11 @@ Only forwards audio with detected speech to the ASR service.
 """
 
 import asyncio
+import logging
 import signal
-from datetime import datetime
+import time
+
+import uvloop
 
 from cairu_common.config import get_settings
 from cairu_common.logging import setup_logging, get_logger
@@ -18,7 +21,7 @@ from cairu_common.metrics import VAD_LATENCY, set_service_info, set_component_he
 from src.detector import SileroVAD
 
 settings = get_settings()
-logger = get_logger()
+logger = get_logger(service="vad")
 
 
 class VADService:
@@ -28,6 +31,7 @@ class VADService:
         self.redis: RedisStreamClient | None = None
         self.vad: SileroVAD | None = None
         self._running = False
+        self._eviction_task: asyncio.Task | None = None
 
     async def start(self):
         """Initialize and start the VAD service."""
@@ -51,6 +55,7 @@ class VADService:
         set_component_health("redis", True)
 
         self._running = True
+        self._eviction_task = asyncio.create_task(self._evict_idle_sessions())
         logger.info("vad_service_started")
 
         # Start processing loop
@@ -60,8 +65,12 @@ class VADService:
         """Gracefully stop the service."""
         logger.info("vad_service_stopping")
         self._running = False
+        if self._eviction_task:
+            self._eviction_task.cancel()
         if self.redis:
             await self.redis.disconnect()
+        if self.vad:
+            self.vad.close()
         logger.info("vad_service_stopped")
 
     async def _process_audio_stream(self):
@@ -69,22 +78,46 @@ class VADService:
         if not self.redis or not self.vad:
             raise RuntimeError("Service not initialized")
 
-        async for message_id, data in self.redis.consume(
+        async for batch in self.redis.consume_batch(
             RedisStreamClient.STREAMS["audio_inbound"],
             consumer_group="vad",
             consumer_name="vad-main",
+            count=16,
         ):
             if not self._running:
                 break
 
-            try:
-                await self._process_segment(data)
-            except Exception as e:
-                logger.error("vad_processing_error", message_id=message_id, error=str(e))
-
-    async def _process_segment(self, data: dict):
-        """Process audio segment with boundary detection."""
-        start_time = datetime.utcnow()
+            # Results for the whole batch go out in one pipelined round trip
+            results: list[tuple[str, VADResult]] = []
+            for message_id, data in batch:
+                try:
+                    result = await self._process_segment(data)
+                except Exception as e:
+                    logger.error("vad_processing_error", message_id=message_id, error=str(e))
+                    continue
+                if result is not None:
+                    results.append((RedisStreamClient.STREAMS["audio_segments"], result))
+
+            if results:
+                try:
+                    await self.redis.publish_many(results)
+                except Exception as e:
+                    logger.error("vad_publish_error", count=len(results), error=str(e))
+
+    async def _evict_idle_sessions(self, interval_s: float = 30.0):
+        """Periodically drop VAD sessions abandoned mid-utterance."""
+        while self._running:
+            await asyncio.sleep(interval_s)
+            self.vad.evict_idle_sessions()
+
+    async def _process_segment(self, data: dict) -> VADResult | None:
+        """
+        Process audio segment with boundary detection.
+
+        Returns:
+            The result to forward to ASR, or None if there is nothing to send
+        """
+        t0 = time.perf_counter_ns()
 
         device_id = data.get("device_id", "unknown")
         session_id = data.get("session_id", "unknown")
@@ -93,23 +126,15 @@ class VADService:
 
         if not audio_data:
             logger.warning("empty_audio_segment", device_id=device_id)
-            return
-
-        # Convert from base64 if needed
-        if isinstance(audio_data, str):
-            import base64
-            audio_data = base64.b64decode(audio_data)
-
-        # Record latency
-        latency_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
-        VAD_LATENCY.observe(latency_ms)
+            return None
 
         if is_streaming:
             # Streaming mode: use boundary detection
             speech_ended, full_audio = await self.vad.process_with_boundary(
                 session_id, audio_data
             )
-            
+            VAD_LATENCY.observe((time.perf_counter_ns() - t0) / 1e6)
+
             if speech_ended and full_audio:
                 # Forward complete utterance to ASR
                 result = VADResult(
@@ -120,23 +145,24 @@ class VADService:
                     audio_data=full_audio,
                     duration_ms=len(full_audio) // 32,
                 )
-
-                await self.redis.publish(
-                    RedisStreamClient.STREAMS["audio_segments"],
-                    result,
-                )
                 logger.info("utterance_forwarded_to_asr", device_id=device_id, duration_ms=len(full_audio) // 32)
+                return result
         else:
             # Legacy mode: simple pass-through for complete utterances
             has_speech, probability = await self.vad.detect(audio_data)
 
-            logger.debug(
-                "vad_result",
-                device_id=device_id,
-                has_speech=has_speech,
-                probability=round(probability, 3),
-                latency_ms=round(latency_ms, 2),
-            )
+            # Record latency
+            latency_ms = (time.perf_counter_ns() - t0) / 1e6
+            VAD_LATENCY.observe(latency_ms)
+
+            if logger.is_enabled_for(logging.DEBUG):
+                logger.debug(
+                    "vad_result",
+                    device_id=device_id,
+                    has_speech=has_speech,
+                    probability=round(probability, 3),
+                    latency_ms=round(latency_ms, 2),
+                )
 
             if has_speech:
                 result = VADResult(
@@ -147,12 +173,10 @@ class VADService:
                     audio_data=audio_data,
                     duration_ms=len(audio_data) // 32,
                 )
-
-                await self.redis.publish(
-                    RedisStreamClient.STREAMS["audio_segments"],
-                    result,
-                )
                 logger.debug("speech_forwarded_to_asr", device_id=device_id)
+                return result
+
+        return None
 
 
 async def main():
@@ -160,7 +184,7 @@ async def main():
     service = VADService()
 
     # Handle shutdown signals
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
     for sig in (signal.SIGTERM, signal.SIGINT):
         loop.add_signal_handler(sig, lambda: asyncio.create_task(service.stop()))
 
@@ -168,5 +192,5 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    uvloop.run(main())
 
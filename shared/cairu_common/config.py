@@ -5,11 +5,58 @@ Uses Pydantic Settings for environment variable loading and validation.
 Simplified for Alpha: Single device, single user.
 """
 
+import os
+from collections.abc import Mapping
 from functools import lru_cache
 from typing import Literal
 
+from dotenv import dotenv_values
 from pydantic import Field, RedisDsn
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings import (
+    BaseSettings,
+    EnvSettingsSource,
+    PydanticBaseSettingsSource,
+    SettingsConfigDict,
+)
+from pydantic_settings.sources import DotenvType
+
+
+@lru_cache
+def _read_env_file(path: str, encoding: str | None) -> Mapping[str, str | None]:
+    """Parse an env file once per process, keyed case-insensitively."""
+    if not os.path.isfile(path):
+        return {}
+    values = dotenv_values(path, encoding=encoding or "utf-8")
+    return {key.lower(): value for key, value in values.items()}
+
+
+class _CachedDotEnvSource(EnvSettingsSource):
+    """Env file source that shares one parse of each file across settings classes."""
+
+    def __init__(
+        self,
+        settings_cls: type[BaseSettings],
+        env_file: DotenvType | None,
+        env_file_encoding: str | None,
+    ):
+        # Set before the base init, which loads the variables
+        self.env_file = env_file
+        self.env_file_encoding = env_file_encoding
+        super().__init__(settings_cls)
+
+    def _load_env_vars(self) -> Mapping[str, str | None]:
+        env_files = self.env_file
+        if env_files is None:
+            return {}
+        if isinstance(env_files, (str, os.PathLike)):
+            env_files = [env_files]
+
+        # Later files override earlier ones, as with the stock source
+        env_vars: dict[str, str | None] = {}
+        for env_file in env_files:
+            path = os.path.abspath(os.path.expanduser(env_file))
+            env_vars.update(_read_env_file(path, self.env_file_encoding))
+        return env_vars
 
 
 class Settings(BaseSettings):
@@ -32,6 +79,29 @@ class Settings(BaseSettings):
     # Feature flags
     enable_proactive_rules: bool = True
 
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> tuple[PydanticBaseSettingsSource, ...]:
+        # Same precedence as the default, with .env read through the shared
+        # cache. The stock source has already resolved any _env_file or
+        # _env_file_encoding passed at construction.
+        return (
+            init_settings,
+            env_settings,
+            _CachedDotEnvSource(
+                settings_cls,
+                env_file=dotenv_settings.env_file,
+                env_file_encoding=dotenv_settings.env_file_encoding,
+            ),
+            file_secret_settings,
+        )
+
     @property
     def is_development(self) -> bool:
         return self.environment == "development"
@@ -68,6 +138,8 @@ class TTSSettings(Settings):
     service_name: str = "tts"
     piper_voice: str = "en_US-lessac-low"  # Faster voice (~200ms savings vs medium)
     piper_model_path: str = "/app/models"
+    piper_quantize: bool = True  # INT8 dynamic quantization of the voice model
+    piper_cache_size: int = 64  # Short phrases kept as synthesized audio (0 disables)
 
 
 class OrchestratorSettings(Settings):
@@ -2,32 +2,302 @@
 Structured logging setup for cAIru services.
 
 Provides JSON-formatted logs with correlation IDs for distributed tracing.
+Log lines are queued and written to stdout in batches from the event loop,
+so a log call never blocks on the pipe.
 """
 
+import asyncio
+import atexit
 import logging
+import os
 import sys
+import threading
+import time
+from collections import deque
 from contextvars import ContextVar
 from typing import Any
 
 import structlog
 from structlog.types import Processor
 
-# Context variable for request/trace correlation
-correlation_id: ContextVar[str | None] = ContextVar("correlation_id", default=None)
-user_id: ContextVar[str | None] = ContextVar("user_id", default=None)
+from cairu_common.metrics import LOGS_DROPPED
+
+try:
+    import orjson
+
+    # Same as the Redis client's payload options, plus the line terminator
+    _ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+    )
+except ImportError:
+    orjson = None
+
+# Context variable for request/trace correlation: correlation_id and user_id
+# fields added to every entry. The shared empty default lets the common
+# no-context case skip the update with one identity check.
+_EMPTY_CONTEXT: dict[str, str] = {}
+_log_context: ContextVar[dict[str, str]] = ContextVar("_log_context", default=_EMPTY_CONTEXT)
+
+# (service_name, level, json_format) of the active configuration
+_CONFIGURED: tuple[str, int, bool] | None = None
 
 
 def add_correlation_id(
     logger: logging.Logger, method_name: str, event_dict: dict[str, Any]
 ) -> dict[str, Any]:
     """Add correlation ID to log entries if available."""
-    if cid := correlation_id.get():
-        event_dict["correlation_id"] = cid
-    if uid := user_id.get():
-        event_dict["user_id"] = uid
+    ctx = _log_context.get()
+    if ctx is not _EMPTY_CONTEXT:
+        event_dict.update(ctx)
     return event_dict
 
 
+# Per-second rate limits for noisy events; events not listed are never sampled
+_SAMPLE_RATES: dict[str, float] = {
+    "message_published": 100.0,
+}
+
+# Levels that always pass through sampling
+_UNSAMPLED_METHODS = frozenset(
+    {"warning", "warn", "error", "err", "exception", "critical", "fatal"}
+)
+
+# event -> [last refill (ns), tokens, entries dropped since the last one emitted]
+_sample_buckets: dict[str, list] = {}
+
+
+def sample_by_event(
+    logger: logging.Logger, method_name: str, event_dict: dict[str, Any]
+) -> dict[str, Any]:
+    """
+    Rate-limit noisy events with a per-event token bucket.
+
+    Entries over the rate are dropped; the next entry that gets through
+    carries `sampled_count`, the number of entries it stands for.
+    Warnings and errors are never sampled.
+    """
+    event = event_dict.get("event")
+    rate = _SAMPLE_RATES.get(event)
+    if rate is None or method_name in _UNSAMPLED_METHODS:
+        return event_dict
+
+    now = time.monotonic_ns()
+    bucket = _sample_buckets.get(event)
+    if bucket is None:
+        # Start full, allowing a one-second burst
+        bucket = _sample_buckets[event] = [now, rate, 0]
+    else:
+        bucket[1] = min(rate, bucket[1] + (now - bucket[0]) * rate / 1e9)
+        bucket[0] = now
+
+    if bucket[1] < 1.0:
+        bucket[2] += 1
+        raise structlog.DropEvent
+
+    bucket[1] -= 1.0
+    if bucket[2]:
+        event_dict["sampled_count"] = bucket[2] + 1
+        bucket[2] = 0
+    return event_dict
+
+
+def _json_default(value: Any) -> str:
+    """Render values orjson can't serialize natively (bytes are decoded)."""
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return str(value)
+
+
+def orjson_renderer(
+    logger: logging.Logger, method_name: str, event_dict: dict[str, Any]
+) -> bytes:
+    """
+    Render an entry straight to a newline-terminated JSON line in bytes.
+
+    Entries orjson can't encode (e.g. nesting too deep) fall back to their
+    values' string forms, so a log call never raises into the caller.
+    """
+    try:
+        return orjson.dumps(event_dict, default=_json_default, option=_ORJSON_OPTIONS)
+    except Exception as e:
+        fallback = {str(key): _safe_str(value) for key, value in event_dict.items()}
+        fallback["log_render_error"] = str(e)
+        return orjson.dumps(fallback, option=_ORJSON_OPTIONS)
+
+
+def _safe_str(value: Any) -> str:
+    """str() that can't fail, for the renderer's fallback path."""
+    try:
+        return _json_default(value)
+    except Exception:
+        return f"<unrenderable {type(value).__name__}>"
+
+
+# Processor chains are built once at import; setup_logging only picks one
+_SHARED_PROCESSORS: list[Processor] = [
+    sample_by_event,  # First, so dropped entries skip the rest of the chain
+    structlog.processors.add_log_level,
+    structlog.processors.TimeStamper(fmt="iso"),
+    add_correlation_id,
+    structlog.processors.StackInfoRenderer(),
+    structlog.processors.format_exc_info,
+]
+
+# Production: JSON output, rendered directly to bytes when orjson is available
+_JSON_CHAIN: list[Processor] = (
+    [*_SHARED_PROCESSORS, orjson_renderer]
+    if orjson is not None
+    else [
+        *_SHARED_PROCESSORS,
+        structlog.processors.UnicodeDecoder(),
+        structlog.processors.JSONRenderer(),
+    ]
+)
+
+# Development: colored console output
+_CONSOLE_CHAIN: list[Processor] = [
+    *_SHARED_PROCESSORS,
+    structlog.processors.UnicodeDecoder(),
+    structlog.dev.ConsoleRenderer(colors=True),
+]
+
+
+class _QueueSink:
+    """
+    Batches rendered log lines and writes them to stdout off the hot path.
+
+    Lines are appended to a deque (safe from executor threads too) and a
+    task on the event loop drains them with one writev() per burst. Without
+    a running drainer, lines are written synchronously.
+
+    Output goes to whatever sys.stdout is at write time: its file
+    descriptor when it has one, otherwise its write() (e.g. under pytest's
+    capsys or contextlib.redirect_stdout).
+    """
+
+    MAX_PENDING = 10_000  # Lines beyond this are dropped and counted
+    MAX_BATCH = 512  # Buffers per writev(), below IOV_MAX
+    FLUSH_INTERVAL_S = 0.01  # Time a burst is allowed to accumulate
+
+    def __init__(self):
+        self._pending: deque[bytes] = deque()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: int | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start draining on the running event loop, if there is one."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        if self._loop is loop and self._task is not None and not self._task.done():
+            return
+
+        self._loop = loop
+        self._loop_thread = threading.get_ident()
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._drain())
+
+    def write(self, line: bytes) -> None:
+        """Queue a log line for the drainer."""
+        if self._task is None or self._task.done():
+            self._write_all([line])
+            return
+
+        if len(self._pending) >= self.MAX_PENDING:
+            LOGS_DROPPED.inc()
+            return
+
+        self._pending.append(line)
+        if not self._wakeup.is_set():
+            if threading.get_ident() == self._loop_thread:
+                self._wakeup.set()
+            else:
+                try:
+                    self._loop.call_soon_threadsafe(self._wakeup.set)
+                except RuntimeError:
+                    # Loop already closed: nothing will drain, write it out now
+                    self.flush()
+
+    def flush(self) -> None:
+        """Write out everything queued so far."""
+        while self._pending:
+            batch = []
+            while self._pending and len(batch) < self.MAX_BATCH:
+                batch.append(self._pending.popleft())
+            self._write_all(batch)
+
+    async def _drain(self) -> None:
+        try:
+            while True:
+                await self._wakeup.wait()
+                await asyncio.sleep(self.FLUSH_INTERVAL_S)
+                self._wakeup.clear()
+                self.flush()
+        finally:
+            self.flush()
+
+    def _write_all(self, buffers: list[bytes]) -> None:
+        stream = sys.stdout
+        if stream is None:
+            return
+
+        try:
+            fd = stream.fileno()
+        except (AttributeError, OSError, ValueError):
+            # No descriptor behind stdout (io.UnsupportedOperation is both)
+            stream.write(b"".join(buffers).decode("utf-8", errors="replace"))
+            return
+
+        # Keep ordering with anything written through sys.stdout itself
+        stream.flush()
+        written = os.writev(fd, buffers)
+        total = sum(map(len, buffers))
+        if written < total:
+            # Partial write (e.g. a full pipe): finish the remainder
+            tail = memoryview(b"".join(buffers))[written:]
+            while tail:
+                tail = tail[os.write(fd, tail):]
+
+
+class _QueueLogger:
+    """
+    structlog logger that hands rendered lines to the queue sink.
+
+    Bytes come from orjson_renderer already newline-terminated; str output
+    from the other renderers is terminated and encoded here.
+    """
+
+    def __init__(self, sink: _QueueSink):
+        self._sink = sink
+
+    def msg(self, message: str | bytes) -> None:
+        if isinstance(message, str):
+            message = (message + "\n").encode()
+        self._sink.write(message)
+
+    log = debug = info = warn = warning = msg
+    fatal = failure = err = error = critical = exception = msg
+
+
+class _SinkHandler(logging.Handler):
+    """Stdlib logging handler that writes records through the queue sink."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            _SINK.write((self.format(record) + "\n").encode())
+        except Exception:
+            self.handleError(record)
+
+
+_SINK = _QueueSink()
+_QUEUE_LOGGER = _QueueLogger(_SINK)
+atexit.register(_SINK.flush)
+
+
 def setup_logging(
     service_name: str,
     log_level: str = "INFO",
@@ -41,58 +311,61 @@ def setup_logging(
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR)
         json_format: Whether to output JSON (True) or console format (False)
     """
-    # Shared processors for all log entries
-    shared_processors: list[Processor] = [
-        structlog.contextvars.merge_contextvars,
-        structlog.processors.add_log_level,
-        structlog.processors.TimeStamper(fmt="iso"),
-        add_correlation_id,
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-    ]
+    global _CONFIGURED
 
-    if json_format:
-        # Production: JSON output
-        renderer: Processor = structlog.processors.JSONRenderer()
-    else:
-        # Development: colored console output
-        renderer = structlog.dev.ConsoleRenderer(colors=True)
+    # Drain on this loop even if the configuration is unchanged
+    _SINK.start()
+
+    level = getattr(logging, log_level.upper())
+    if _CONFIGURED == (service_name, level, json_format):
+        return
 
     structlog.configure(
-        processors=[
-            *shared_processors,
-            structlog.processors.UnicodeDecoder(),
-            renderer,
-        ],
-        wrapper_class=structlog.make_filtering_bound_logger(
-            getattr(logging, log_level.upper())
-        ),
+        processors=_JSON_CHAIN if json_format else _CONSOLE_CHAIN,
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(file=sys.stdout),
+        logger_factory=lambda *args: _QUEUE_LOGGER,
         cache_logger_on_first_use=True,
     )
 
-    # Also configure standard library logging
+    # Also configure standard library logging (third-party libraries), batched
+    # through the same sink instead of a flush per record
     logging.basicConfig(
         format="%(message)s",
-        stream=sys.stdout,
-        level=getattr(logging, log_level.upper()),
+        handlers=[_SinkHandler()],
+        level=level,
     )
 
+    _CONFIGURED = (service_name, level, json_format)
+
     # Log startup
     logger = get_logger()
     logger.info("logging_configured", service=service_name, level=log_level)
 
 
-def get_logger() -> structlog.BoundLogger:
-    """Get a configured structlog logger."""
-    return structlog.get_logger()
+def get_logger(**initial_values: Any) -> structlog.BoundLogger:
+    """
+    Get a configured structlog logger.
+
+    Safe to call at import time: binding is deferred until the first log
+    call, after setup_logging has configured structlog.
+
+    Args:
+        **initial_values: Context bound to every entry from this logger
+    """
+    return structlog.get_logger(**initial_values)
 
 
 def set_correlation_context(corr_id: str | None = None, usr_id: str | None = None):
     """Set correlation context for the current async context."""
+    if not (corr_id or usr_id):
+        return
+
+    # Copy rather than mutate: the dict may be shared with other contexts
+    ctx = dict(_log_context.get())
     if corr_id:
-        correlation_id.set(corr_id)
+        ctx["correlation_id"] = corr_id
     if usr_id:
-        user_id.set(usr_id)
+        ctx["user_id"] = usr_id
+    _log_context.set(ctx)
 
@@ -5,6 +5,9 @@ Provides pre-defined metrics for pipeline monitoring and performance tracking.
 Simplified for Alpha.
 """
 
+import gzip
+import time
+
 from prometheus_client import Counter, Gauge, Histogram, Info, generate_latest
 
 # =============================================================================
@@ -13,40 +16,49 @@ from prometheus_client import Counter, Gauge, Histogram, Info, generate_latest
 
 SERVICE_INFO = Info("cairu_service", "Service information")
 
+# Alpha has a single Companion device, so device_id is reported once in
+# SERVICE_INFO rather than as a label on per-observation metrics
+DEFAULT_DEVICE_ID = "companion-001"
+
 # =============================================================================
 # Pipeline Latency Metrics
 # =============================================================================
 
+
+def _exponential_buckets(start: float, factor: float, count: int) -> tuple[int, ...]:
+    """Latency buckets growing by `factor`, rounded to whole milliseconds."""
+    return tuple(sorted({round(start * factor**i) for i in range(count)}))
+
+
 PIPELINE_LATENCY = Histogram(
     "cairu_pipeline_latency_ms",
     "End-to-end pipeline latency in milliseconds",
-    ["device_id"],
-    buckets=[100, 200, 300, 400, 500, 600, 700, 800, 1000, 1500, 2000, 5000],
+    buckets=_exponential_buckets(50, 1.5, 14),  # 50ms .. ~9.7s
 )
 
 VAD_LATENCY = Histogram(
     "cairu_vad_latency_ms",
     "Voice activity detection latency in milliseconds",
-    buckets=[5, 10, 20, 50, 100],
+    buckets=_exponential_buckets(1, 2, 8),  # 1ms .. 128ms
 )
 
 ASR_LATENCY = Histogram(
     "cairu_asr_latency_ms",
     "Speech recognition latency in milliseconds",
-    buckets=[50, 100, 200, 300, 500, 750, 1000, 2000],
+    buckets=_exponential_buckets(25, 1.5, 12),  # 25ms .. ~2.2s
 )
 
 LLM_LATENCY = Histogram(
     "cairu_llm_latency_ms",
     "LLM inference latency in milliseconds",
     ["model", "backend"],
-    buckets=[100, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000],
+    buckets=_exponential_buckets(50, 1.5, 14),  # 50ms .. ~9.7s
 )
 
 TTS_LATENCY = Histogram(
     "cairu_tts_latency_ms",
     "Text-to-speech latency in milliseconds",
-    buckets=[20, 50, 100, 200, 300, 500],
+    buckets=_exponential_buckets(10, 1.5, 11),  # 10ms .. ~580ms
 )
 
 # =============================================================================
@@ -68,7 +80,6 @@ MESSAGES_PROCESSED = Counter(
 AUDIO_SEGMENTS_RECEIVED = Counter(
     "cairu_audio_segments_received_total",
     "Total audio segments received from Companion device",
-    ["device_id"],
 )
 
 # =============================================================================
@@ -95,6 +106,11 @@ REDIS_CONNECTION_STATUS = Gauge(
     "Redis connection status (1=connected, 0=disconnected)",
 )
 
+LOGS_DROPPED = Counter(
+    "cairu_logs_dropped_total",
+    "Log lines dropped because the async log queue was full",
+)
+
 # =============================================================================
 # LLM Specific Metrics
 # =============================================================================
@@ -127,28 +143,67 @@ ASR_AUDIO_DURATION = Histogram(
     buckets=[500, 1000, 2000, 3000, 5000, 10000, 20000],
 )
 
+# =============================================================================
+# TTS Specific Metrics
+# =============================================================================
+
+TTS_CACHE_REQUESTS = Counter(
+    "cairu_tts_cache_requests_total",
+    "TTS phrase cache lookups",
+    ["result"],  # result: hit, miss
+)
+
 # =============================================================================
 # Helper Functions
 # =============================================================================
 
 
-def set_service_info(name: str, version: str, environment: str) -> None:
+def set_service_info(
+    name: str,
+    version: str,
+    environment: str,
+    device_id: str = DEFAULT_DEVICE_ID,
+) -> None:
     """Set service identification info."""
     SERVICE_INFO.info({
         "name": name,
         "version": version,
         "environment": environment,
+        "device_id": device_id,
     })
 
 
+# Scrapes within this window reuse the last rendered output
+METRICS_CACHE_TTL_S = 5.0
+
+# (rendered at, raw, gzip-compressed) for the last scrape
+_last_render: tuple[float, bytes, bytes] | None = None
+
+
+def _render_metrics() -> tuple[float, bytes, bytes]:
+    """Render metrics, reusing the last output while it is fresh."""
+    global _last_render
+
+    now = time.monotonic()
+    if _last_render is None or now - _last_render[0] >= METRICS_CACHE_TTL_S:
+        raw = generate_latest()
+        _last_render = (now, raw, gzip.compress(raw, compresslevel=1))
+    return _last_render
+
+
 def get_metrics() -> bytes:
-    """Generate Prometheus metrics output."""
-    return generate_latest()
+    """Generate Prometheus metrics output (cached for METRICS_CACHE_TTL_S)."""
+    return _render_metrics()[1]
+
 
+def get_metrics_gzip() -> bytes:
+    """Generate gzip-compressed Prometheus metrics output (cached)."""
+    return _render_metrics()[2]
 
-def record_pipeline_latency(device_id: str, latency_ms: float) -> None:
+
+def record_pipeline_latency(latency_ms: float) -> None:
     """Record end-to-end pipeline latency."""
-    PIPELINE_LATENCY.labels(device_id=device_id).observe(latency_ms)
+    PIPELINE_LATENCY.observe(latency_ms)
 
 
 def record_request(service: str, status: str = "success") -> None:
@@ -159,3 +214,4 @@ def record_request(service: str, status: str = "success") -> None:
 def set_component_health(component: str, healthy: bool) -> None:
     """Set health status of a component."""
     COMPONENT_HEALTH.labels(component=component).set(1 if healthy else 0)
+
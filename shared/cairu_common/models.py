@@ -2,20 +2,25 @@
 Shared Pydantic models for inter-service communication.
 
 These models define the contract between services via Redis Streams.
+Timestamps are UTC ISO-8601 strings with microseconds (see _now_iso).
 Simplified for Alpha: Single device, single user.
 """
 
-import base64
-from datetime import datetime
+import time
 from enum import Enum
 from typing import Annotated, Any
 
-from pydantic import BaseModel, Field, PlainSerializer, BeforeValidator
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, PlainSerializer
+
+try:
+    import pybase64 as base64  # SIMD-accelerated, same API as the stdlib module
+except ImportError:
+    import base64
 
 
 def _encode_bytes(v: bytes) -> str:
     """Encode bytes to base64 string for JSON serialization."""
-    return base64.b64encode(v).decode("utf-8")
+    return base64.b64encode(v).decode("ascii")
 
 
 def _decode_bytes(v: Any) -> bytes:
@@ -23,10 +28,17 @@ def _decode_bytes(v: Any) -> bytes:
     if isinstance(v, bytes):
         return v
     if isinstance(v, str):
-        return base64.b64decode(v)
+        return base64.b64decode(v, validate=False)
     raise ValueError(f"Cannot decode bytes from {type(v)}")
 
 
+def _now_iso() -> str:
+    """Current UTC time as ISO-8601 with microseconds, e.g. 2024-01-01T12:00:00.000000Z."""
+    t = time.time_ns()
+    s, ns = divmod(t, 1_000_000_000)
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(s)) + f".{ns // 1000:06d}Z"
+
+
 # Custom type for bytes that serializes as base64
 Base64Bytes = Annotated[
     bytes,
@@ -61,7 +73,7 @@ class AudioSegment(BaseModel):
 
     device_id: str = Field(default="companion-001", description="Device identifier")
     session_id: str = Field(..., description="Current conversation session ID")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: str = Field(default_factory=_now_iso)
     audio_data: Base64Bytes = Field(..., description="Raw audio bytes (16kHz, 16-bit PCM)")
     duration_ms: int = Field(..., description="Duration of audio segment in milliseconds")
     is_final: bool = Field(default=False, description="Whether this is the final segment")
@@ -70,9 +82,11 @@ class AudioSegment(BaseModel):
 class VADResult(BaseModel):
     """Result from Voice Activity Detection."""
 
+    model_config = ConfigDict(frozen=True)
+
     device_id: str = Field(default="companion-001")
     session_id: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: str = Field(default_factory=_now_iso)
     has_speech: bool
     speech_probability: float = Field(ge=0.0, le=1.0)
     audio_data: Base64Bytes | None = Field(default=None, description="Audio if speech detected")
@@ -87,9 +101,11 @@ class VADResult(BaseModel):
 class Transcript(BaseModel):
     """Transcription result from ASR."""
 
+    model_config = ConfigDict(frozen=True)
+
     device_id: str = Field(default="companion-001")
     session_id: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: str = Field(default_factory=_now_iso)
     text: str = Field(..., description="Transcribed text")
     confidence: float = Field(ge=0.0, le=1.0, description="Transcription confidence")
     language: str = Field(default="en")
@@ -109,7 +125,7 @@ class LLMRequest(BaseModel):
     device_id: str = Field(default="companion-001")
     session_id: str
     user_id: str = Field(default="user-001")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: str = Field(default_factory=_now_iso)
 
     # Context
     user_message: str = Field(..., description="The user's transcribed message")
@@ -141,7 +157,7 @@ class LLMResponse(BaseModel):
     request_id: str
     device_id: str = Field(default="companion-001")
     session_id: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: str = Field(default_factory=_now_iso)
 
     # Response content
     text: str = Field(..., description="Generated response text")
@@ -166,7 +182,7 @@ class TTSRequest(BaseModel):
     request_id: str
     device_id: str = Field(default="companion-001")
     session_id: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: str = Field(default_factory=_now_iso)
 
     text: str = Field(..., description="Text to synthesize")
     voice_id: str | None = Field(default=None, description="Voice to use (optional)")
@@ -179,7 +195,7 @@ class TTSResponse(BaseModel):
     request_id: str
     device_id: str = Field(default="companion-001")
     session_id: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: str = Field(default_factory=_now_iso)
 
     audio_data: Base64Bytes = Field(..., description="Synthesized audio (WAV format)")
     duration_ms: int = Field(..., description="Audio duration in milliseconds")
@@ -201,10 +217,12 @@ class TTSResponse(BaseModel):
 class ConversationTurn(BaseModel):
     """A single turn in a conversation."""
 
+    model_config = ConfigDict(frozen=True)
+
     turn_id: str
     session_id: str
     user_id: str = Field(default="user-001")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: str = Field(default_factory=_now_iso)
 
     role: str = Field(..., description="'user' or 'assistant'")
     content: str
@@ -225,10 +243,13 @@ class ConversationTurn(BaseModel):
 class UserProfile(BaseModel):
     """User profile for personalization."""
 
+    # Frozen against mutation only; the dict fields keep instances unhashable
+    model_config = ConfigDict(frozen=True)
+
     user_id: str = Field(default="user-001")
     device_id: str = Field(default="companion-001")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: str = Field(default_factory=_now_iso)
+    updated_at: str = Field(default_factory=_now_iso)
 
     # Basic info
     name: str = Field(default="Friend")
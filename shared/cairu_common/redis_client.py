@@ -5,17 +5,47 @@ Provides a clean API for publishing and consuming messages via Redis Streams.
 """
 
 import asyncio
+import importlib
 import json
-from datetime import datetime
-from typing import Any, AsyncIterator, Callable
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable
 
-import redis.asyncio as redis
 from pydantic import BaseModel
 
 from cairu_common.logging import get_logger
+from cairu_common.models import AudioSegment, TTSResponse, VADResult
+
+if TYPE_CHECKING:
+    import redis.asyncio as redis
 
 logger = get_logger()
 
+try:
+    import orjson
+
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def _json_dumps(value: Any) -> bytes:
+        return orjson.dumps(value, default=str, option=_ORJSON_OPTIONS)
+
+    _json_loads = orjson.loads  # Accepts bytes; errors subclass json.JSONDecodeError
+except ImportError:
+    def _json_dumps(value: Any) -> bytes:
+        return json.dumps(value, default=str).encode()
+
+    _json_loads = json.loads
+
+# Envelope field holding the JSON-encoded message
+_DATA_FIELD = b"data"
+
+# Models whose bytes field is stored as its own binary stream field (under
+# the same name) instead of base64 inside the JSON envelope
+_BINARY_FIELDS: dict[type[BaseModel], str] = {
+    AudioSegment: "audio_data",
+    VADResult: "audio_data",
+    TTSResponse: "audio_data",
+}
+
 
 class RedisStreamClient:
     """
@@ -45,14 +75,24 @@ class RedisStreamClient:
         "events": "cairu:events:caregiver",
     }
 
+    # Dict message field carried as a raw binary stream field instead of
+    # base64 inside the JSON envelope (models use _BINARY_FIELDS)
+    AUDIO_FIELD = "audio_data"
+
     def __init__(self, redis_url: str):
         self.redis_url = redis_url
         self._redis: redis.Redis | None = None
+        self._redis_module: ModuleType | None = None  # redis.asyncio, loaded on connect
         self._consumer_tasks: list[asyncio.Task] = []
 
     async def connect(self) -> None:
         """Establish connection to Redis."""
-        self._redis = redis.from_url(
+        # Imported here so modules that only need the client for type hints
+        # don't pay for loading redis-py
+        if self._redis_module is None:
+            self._redis_module = importlib.import_module("redis.asyncio")
+
+        self._redis = self._redis_module.from_url(
             self.redis_url,
             encoding="utf-8",
             decode_responses=False,  # We handle encoding ourselves
@@ -82,6 +122,10 @@ class RedisStreamClient:
         """
         Publish a message to a Redis Stream.
 
+        Raw audio bytes (a dict's `audio_data`, or a model's field listed in
+        _BINARY_FIELDS) are stored as a separate binary stream field rather
+        than base64 inside the JSON.
+
         Args:
             stream: Stream name (use STREAMS constants)
             message: Message to publish (dict or Pydantic model)
@@ -93,18 +137,9 @@ class RedisStreamClient:
         if self._redis is None:
             raise RuntimeError("Not connected to Redis")
 
-        # Convert Pydantic model to dict
-        if isinstance(message, BaseModel):
-            data = message.model_dump(mode="json")
-        else:
-            data = message
-
-        # Serialize to JSON bytes
-        payload = {"data": json.dumps(data, default=str)}
-
         message_id = await self._redis.xadd(
             stream,
-            payload,
+            self._encode_message(message),
             maxlen=maxlen,
             approximate=True,
         )
@@ -115,7 +150,68 @@ class RedisStreamClient:
             message_id=message_id,
         )
 
-        return message_id.decode() if isinstance(message_id, bytes) else message_id
+        return message_id.decode()
+
+    async def publish_many(
+        self,
+        items: list[tuple[str, dict[str, Any] | BaseModel]],
+        maxlen: int = 10000,
+    ) -> list[str]:
+        """
+        Publish several messages in one round trip.
+
+        The XADDs are sent through a non-transactional pipeline, so a burst
+        of messages costs one write and one read instead of one each.
+
+        Args:
+            items: (stream, message) pairs, published in order
+            maxlen: Maximum stream length (older messages trimmed)
+
+        Returns:
+            Message IDs assigned by Redis, in the order of `items`
+        """
+        if self._redis is None:
+            raise RuntimeError("Not connected to Redis")
+        if not items:
+            return []
+
+        pipe = self._redis.pipeline(transaction=False)
+        for stream, message in items:
+            pipe.xadd(stream, self._encode_message(message), maxlen=maxlen, approximate=True)
+        message_ids = await pipe.execute()
+
+        logger.debug(
+            "messages_published",
+            streams=sorted({stream for stream, _ in items}),
+            count=len(message_ids),
+        )
+
+        return [message_id.decode() for message_id in message_ids]
+
+    def _encode_message(self, message: dict[str, Any] | BaseModel) -> dict[bytes, bytes]:
+        """Build the stream fields for a message: JSON envelope plus binary field."""
+        # Serialize to JSON bytes, keeping binary data out of the JSON. Models
+        # go straight through Pydantic's Rust serializer without a dict copy.
+        if isinstance(message, BaseModel):
+            field = _BINARY_FIELDS.get(type(message))
+            if field is None:
+                return {_DATA_FIELD: message.__pydantic_serializer__.to_json(message)}
+            binary = getattr(message, field)
+            data_bytes = message.__pydantic_serializer__.to_json(message, exclude={field})
+        else:
+            field = self.AUDIO_FIELD
+            binary = message.get(field)
+            if isinstance(binary, (bytes, bytearray)):
+                data = {k: v for k, v in message.items() if k != field}
+            else:
+                binary = None
+                data = message
+            data_bytes = _json_dumps(data)
+
+        payload = {_DATA_FIELD: data_bytes}
+        if binary is not None:
+            payload[field.encode()] = bytes(binary)
+        return payload
 
     async def consume(
         self,
@@ -128,6 +224,10 @@ class RedisStreamClient:
         """
         Consume messages from a Redis Stream using consumer groups.
 
+        Binary stream fields are returned as raw bytes under their message
+        field name (e.g. `audio_data`). Messages are read and acknowledged
+        in batches of up to `batch_size` (see consume_batch).
+
         Args:
             stream: Stream name to consume from
             consumer_group: Consumer group name
@@ -138,80 +238,84 @@ class RedisStreamClient:
         Yields:
             Tuple of (message_id, message_data)
         """
+        async for batch in self.consume_batch(
+            stream,
+            consumer_group,
+            consumer_name,
+            count=batch_size,
+            block_ms=block_ms,
+        ):
+            for message in batch:
+                yield message
+
+    async def consume_batch(
+        self,
+        stream: str,
+        consumer_group: str,
+        consumer_name: str | None = None,
+        count: int = 16,
+        block_ms: int = 1000,
+    ) -> AsyncIterator[list[tuple[str, dict[str, Any]]]]:
+        """
+        Consume messages from a Redis Stream in batches.
+
+        Each XREADGROUP returns up to `count` messages; the whole batch is
+        acknowledged with a single XACK once the caller asks for the next one.
+
+        Args:
+            stream: Stream name to consume from
+            consumer_group: Consumer group name
+            consumer_name: Unique consumer identifier (defaults to random)
+            count: Maximum number of messages per batch
+            block_ms: How long to block waiting for messages
+
+        Yields:
+            List of (message_id, message_data) tuples
+        """
         if self._redis is None:
             raise RuntimeError("Not connected to Redis")
 
         consumer_name = consumer_name or f"consumer-{id(self)}"
+        await self._start_consumer(stream, consumer_group, consumer_name)
 
-        # Create consumer group if it doesn't exist
-        try:
-            await self._redis.xgroup_create(
-                stream,
-                consumer_group,
-                id="0",
-                mkstream=True,
-            )
-            logger.info(
-                "consumer_group_created",
-                stream=stream,
-                group=consumer_group,
-            )
-        except redis.ResponseError as e:
-            if "BUSYGROUP" not in str(e):
-                raise
-
-        logger.info(
-            "consumer_started",
-            stream=stream,
-            group=consumer_group,
-            consumer=consumer_name,
-        )
+        # Responses are bytes (decode_responses=False)
+        _decode = bytes.decode
 
         while True:
             try:
-                # Read new messages
                 messages = await self._redis.xreadgroup(
                     consumer_group,
                     consumer_name,
                     {stream: ">"},
-                    count=batch_size,
+                    count=count,
                     block=block_ms,
                 )
 
                 if not messages:
                     continue
 
-                for stream_name, stream_messages in messages:
+                batch: list[tuple[str, dict[str, Any]]] = []
+                ack_ids: list[bytes] = []
+                for _, stream_messages in messages:
                     for message_id, fields in stream_messages:
+                        # Bad messages are acknowledged with the batch so
+                        # they aren't redelivered
+                        ack_ids.append(message_id)
+                        msg_id = _decode(message_id)
                         try:
-                            # Decode message
-                            msg_id = (
-                                message_id.decode()
-                                if isinstance(message_id, bytes)
-                                else message_id
-                            )
-                            data_bytes = fields.get(b"data") or fields.get("data")
-                            if data_bytes:
-                                if isinstance(data_bytes, bytes):
-                                    data_bytes = data_bytes.decode()
-                                data = json.loads(data_bytes)
-                            else:
-                                data = {}
-
-                            yield msg_id, data
-
-                            # Acknowledge message
-                            await self._redis.xack(stream, consumer_group, message_id)
-
-                        except json.JSONDecodeError as e:
+                            batch.append((msg_id, self._decode_fields(fields)))
+                        except (json.JSONDecodeError, KeyError) as e:
                             logger.error(
                                 "message_decode_error",
                                 stream=stream,
                                 message_id=msg_id,
                                 error=str(e),
                             )
-                            # Acknowledge to prevent reprocessing bad messages
-                            await self._redis.xack(stream, consumer_group, message_id)
+
+                if batch:
+                    yield batch
+
+                await self._redis.xack(stream, consumer_group, *ack_ids)
 
             except asyncio.CancelledError:
                 logger.info("consumer_cancelled", stream=stream)
@@ -220,6 +324,48 @@ class RedisStreamClient:
                 logger.error("consumer_error", stream=stream, error=str(e))
                 await asyncio.sleep(1)  # Back off on errors
 
+    async def _start_consumer(
+        self,
+        stream: str,
+        consumer_group: str,
+        consumer_name: str,
+    ) -> None:
+        """Create the consumer group if it doesn't exist yet."""
+        try:
+            await self._redis.xgroup_create(
+                stream,
+                consumer_group,
+                id="0",
+                mkstream=True,
+            )
+            logger.info(
+                "consumer_group_created",
+                stream=stream,
+                group=consumer_group,
+            )
+        except self._redis_module.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+        logger.info(
+            "consumer_started",
+            stream=stream,
+            group=consumer_group,
+            consumer=consumer_name,
+        )
+
+    def _decode_fields(self, fields: dict[bytes, bytes]) -> dict[str, Any]:
+        """Decode a stream entry's JSON envelope (KeyError if missing) and binary fields."""
+        data = _json_loads(fields[_DATA_FIELD])
+
+        if len(fields) > 1:
+            # Binary fields come back as raw bytes under their message field name
+            for key, value in fields.items():
+                if key != _DATA_FIELD:
+                    data[key.decode()] = value
+
+        return data
+
     async def consume_callback(
         self,
         stream: str,